@@ -2,9 +2,15 @@
 import json
 import os
 import sys
+import string
 from typing import Dict, Any
 from urllib.parse import urlparse
 
+# Допустимые схемы URL репозитория
+_ALLOWED_SCHEMES = frozenset({'http', 'https', 'ftp'})
+# Таблица удаляет все допустимые символы: непустой остаток - ошибка в имени
+_PKG_ALLOWED_TABLE = str.maketrans('', '', string.ascii_letters + string.digits + '-_.')
+
 class ConfigError(Exception):
     """Базовое исключение для ошибок конфигурации"""
     pass
@@ -43,12 +49,11 @@ class DependencyVisualizer:
             if not os.path.exists(self.config_file):
                 raise ConfigError(f"Конфигурационный файл '{self.config_file}' не найден")
 
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                file_content = f.read().strip()
-                if not file_content:
-                    raise ConfigError("Конфигурационный файл пуст")
+            if os.path.getsize(self.config_file) == 0:
+                raise ConfigError("Конфигурационный файл пуст")
 
-                self.config = json.loads(file_content)
+            with open(self.config_file, 'r', encoding='utf-8') as f:
+                self.config = json.load(f)
 
         except json.JSONDecodeError as e:
             raise ConfigError(f"Ошибка парсинга JSON: {e}")
@@ -73,7 +78,7 @@ class DependencyVisualizer:
         if not isinstance(package_name, str):
             raise PackageNameError("Имя пакета должно быть строкой")
 
-        if not all(c.isalnum() or c in ['-', '_', '.'] for c in package_name):
+        if package_name.translate(_PKG_ALLOWED_TABLE):
             raise PackageNameError("Имя пакета содержит недопустимые символы")
 
         if len(package_name) > 100:
@@ -98,7 +103,7 @@ class DependencyVisualizer:
                 result = urlparse(repository_url)
                 if not all([result.scheme, result.netloc]):
                     raise RepositoryURLError("Некорректный URL репозитория")
-                if result.scheme not in ['http', 'https', 'ftp']:
+                if result.scheme not in _ALLOWED_SCHEMES:
                     raise RepositoryURLError("Неподдерживаемая схема URL")
             except Exception as e:
                 raise RepositoryURLError(f"Ошибка парсинга URL: {e}")
@@ -134,14 +139,13 @@ class DependencyVisualizer:
             raise FilterError("Подстрока для фильтрации слишком длинная (максимум 50 символов)")
 
     def display_config(self) -> None:
-        print("=" * 50)
-        print("Конфигурация визуализатора зависимостей:")
-        print("=" * 50)
+        lines = ["=" * 50, "Конфигурация визуализатора зависимостей:", "=" * 50]
 
         for key, value in self.config.items():
-            print(f"{key}: {value}")
+            lines.append(f"{key}: {value}")
 
-        print("=" * 50)
+        lines.append("=" * 50)
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def run(self) -> None:
         try:
@@ -2,11 +2,18 @@
 import json
 import os
 import sys
+import string
+from itertools import chain
 from typing import Dict, Any, List
 from urllib.parse import urlparse
 import urllib.request
 import urllib.error
 
+# Допустимые схемы URL репозитория
+_ALLOWED_SCHEMES = frozenset({'http', 'https'})
+# Таблица удаляет все допустимые символы: непустой остаток - ошибка в имени
+_PKG_ALLOWED_TABLE = str.maketrans('', '', string.ascii_letters + string.digits + '-_.@/')
+
 class ConfigError(Exception):
     """Базовое исключение для ошибок конфигурации"""
     pass
@@ -49,12 +56,11 @@ class DependencyVisualizer:
             if not os.path.exists(self.config_file):
                 raise ConfigError(f"Конфигурационный файл '{self.config_file}' не найден")
 
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                file_content = f.read().strip()
-                if not file_content:
-                    raise ConfigError("Конфигурационный файл пуст")
+            if os.path.getsize(self.config_file) == 0:
+                raise ConfigError("Конфигурационный файл пуст")
 
-                self.config = json.loads(file_content)
+            with open(self.config_file, 'r', encoding='utf-8') as f:
+                self.config = json.load(f)
 
         except json.JSONDecodeError as e:
             raise ConfigError(f"Ошибка парсинга JSON: {e}")
@@ -80,7 +86,7 @@ class DependencyVisualizer:
             raise PackageNameError("Имя пакета должно быть строкой")
 
         # Для npm пакетов допустимы символы: буквы, цифры, -, _, ., @, /
-        if not all(c.isalnum() or c in ['-', '_', '.', '@', '/'] for c in package_name):
+        if package_name.translate(_PKG_ALLOWED_TABLE):
             raise PackageNameError("Имя пакета содержит недопустимые символы")
 
         if len(package_name) > 214:  # Максимальная длина npm пакета
@@ -105,7 +111,7 @@ class DependencyVisualizer:
                 result = urlparse(repository_url)
                 if not all([result.scheme, result.netloc]):
                     raise RepositoryURLError("Некорректный URL репозитория")
-                if result.scheme not in ['http', 'https']:
+                if result.scheme not in _ALLOWED_SCHEMES:
                     raise RepositoryURLError("Неподдерживаемая схема URL")
             except Exception as e:
                 raise RepositoryURLError(f"Ошибка парсинга URL: {e}")
@@ -136,14 +142,13 @@ class DependencyVisualizer:
             raise FilterError("Подстрока для фильтрации слишком длинная (максимум 50 символов)")
 
     def display_config(self) -> None:
-        print("=" * 50)
-        print("Конфигурация визуализатора зависимостей:")
-        print("=" * 50)
+        lines = ["=" * 50, "Конфигурация визуализатора зависимостей:", "=" * 50]
 
         for key, value in self.config.items():
-            print(f"{key}: {value}")
+            lines.append(f"{key}: {value}")
 
-        print("=" * 50)
+        lines.append("=" * 50)
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def get_npm_package_info(self) -> Dict[str, Any]:
 
@@ -209,34 +214,23 @@ class DependencyVisualizer:
                 f"{'...' if len(available_versions) > 5 else ''}"
             )
 
-        # Извлекаем зависимости
-        dependencies = []
-
-        # dependencies - обычные зависимости
-        deps = version_info.get('dependencies', {})
-        dependencies.extend(deps.keys())
-
-        # devDependencies - зависимости разработки
-        dev_deps = version_info.get('devDependencies', {})
-        dependencies.extend(dev_deps.keys())
-
-        # peerDependencies - peer зависимости
-        peer_deps = version_info.get('peerDependencies', {})
-        dependencies.extend(peer_deps.keys())
-
-        # optionalDependencies - опциональные зависимости
-        optional_deps = version_info.get('optionalDependencies', {})
-        dependencies.extend(optional_deps.keys())
-
-        # Убираем дубликаты и применяем фильтр
-        unique_dependencies = list(set(dependencies))
+        # Извлекаем зависимости всех типов: dependencies, devDependencies,
+        # peerDependencies, optionalDependencies. dict.fromkeys убирает
+        # дубликаты за один проход без промежуточного списка и множества
+        unique_dependencies = dict.fromkeys(chain(
+            version_info.get('dependencies', {}),
+            version_info.get('devDependencies', {}),
+            version_info.get('peerDependencies', {}),
+            version_info.get('optionalDependencies', {}),
+        ))
 
         # Применяем фильтр если указан
         filter_substring = self.config.get("filter_substring", "")
         if filter_substring:
+            filter_lower = filter_substring.lower()
             unique_dependencies = [
                 dep for dep in unique_dependencies
-                if filter_substring.lower() in dep.lower()
+                if filter_lower in dep.lower()
             ]
 
         return sorted(unique_dependencies)
@@ -246,15 +240,14 @@ class DependencyVisualizer:
             print("Прямые зависимости не найдены")
             return
 
-        print("\n" + "=" * 50)
-        print(f"ПРЯМЫЕ ЗАВИСИМОСТИ пакета {self.config['package_name']}:")
-        print("=" * 50)
+        lines = ["", "=" * 50, f"ПРЯМЫЕ ЗАВИСИМОСТИ пакета {self.config['package_name']}:", "=" * 50]
 
         for i, dependency in enumerate(self.dependencies, 1):
-            print(f"{i:2d}. {dependency}")
+            lines.append(f"{i:2d}. {dependency}")
 
-        print("=" * 50)
-        print(f"Всего найдено зависимостей: {len(self.dependencies)}")
+        lines.append("=" * 50)
+        lines.append(f"Всего найдено зависимостей: {len(self.dependencies)}")
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def run(self) -> None:
         try: